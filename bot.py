@@ -7,7 +7,11 @@ import random
 from datetime import datetime, timedelta
 import aiohttp
 import asyncio
+import functools
 import re
+from link_index import ForwardedLinkIndex, link_key
+from notifications import load_template_overrides, render_twitch_live, render_youtube_video
+from resilience import Upstream, CircuitBreaker, RetryPolicy, UpstreamError, CircuitOpenError, parse_retry_after
 
 # Load environment variables from .env file
 load_dotenv()
@@ -20,12 +24,19 @@ else:
     genai_client = None
     print("Warning: AI_KEY not found. !ai command will not work.")
 
+AI_MODEL = "gemini-2.5-flash-lite-preview-09-2025"
+# Gemini reports quota back-off in the error body, e.g. "'retryDelay': '30s'" or "Please retry in 30.5s"
+GEMINI_RETRY_PATTERN = r"retry(?:Delay)?'?\"?\s*(?::|in)\s*'?\"?(\d+(?:\.\d+)?)s"
+
 # Rate limiting: Track when AI messages were sent
 ai_message_timestamps = []
 MAX_MESSAGES_PER_HOUR = 10
 
 # Video link forwarding
 LINK_PATTERN = r'https?://[^\s]+'
+REPOST_REACTION = "🔁"
+# Links forwarded in the last 30 minutes; repeats get a reaction on the earlier post instead
+forwarded_links = ForwardedLinkIndex(window=1800, max_entries=500)
 
 def convert_link(link):
     """Convert instagram/tiktok links to add 'kk' prefix, removing any existing prefixes"""
@@ -48,6 +59,60 @@ YOUTUBE_API_KEY = os.getenv('YOUTUBE_API_KEY')
 IRONMOUSE_YOUTUBE_CHANNEL_ID = "UCIeSUTOTkF9Hs7q3SGcO-Ow"  # @IronMouseParty
 last_video_id = None  # Track the last video we've seen
 
+# Optional per-guild notification text, e.g. {"123456789": {"twitch_live": "{title} is live! {url}"}}
+NOTIFICATION_OVERRIDES_FILE = os.getenv('NOTIFICATION_OVERRIDES_FILE', 'notification_overrides.json')
+notification_overrides = load_template_overrides(NOTIFICATION_OVERRIDES_FILE)
+
+# Upstream resilience: retries with capped backoff + a circuit breaker per API
+# YouTube retries sparingly since every search costs 100 units of daily quota
+twitch_upstream = Upstream("Twitch", CircuitBreaker("Twitch", failure_threshold=3, reset_timeout=120), RetryPolicy(max_attempts=3, base_delay=1, max_delay=10))
+youtube_upstream = Upstream("YouTube", CircuitBreaker("YouTube", failure_threshold=3, reset_timeout=600), RetryPolicy(max_attempts=2, base_delay=2, max_delay=10))
+gemini_upstream = Upstream("Gemini", CircuitBreaker("Gemini", failure_threshold=3, reset_timeout=60), RetryPolicy(max_attempts=2, base_delay=1, max_delay=5))
+NETWORK_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError)
+
+def raise_for_upstream(response, name):
+    """Raise a retryable UpstreamError for throttled (429) or failing (5xx) HTTP responses"""
+    if response.status == 429 or response.status >= 500:
+        raise UpstreamError(
+            f"{name} returned HTTP {response.status}",
+            status=response.status,
+            retry_after=parse_retry_after(response.headers.get('Retry-After'))
+        )
+
+async def generate_ai_content(contents):
+    """Generate a Gemini response through the resilience layer
+
+    Raises UpstreamError on quota/server errors or while the Gemini circuit is open.
+    """
+    return await gemini_upstream.call(request_ai_content, contents)
+
+async def request_ai_content(contents):
+    """Single Gemini request, run in a thread so it doesn't block the event loop"""
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(
+            None,
+            functools.partial(genai_client.models.generate_content, model=AI_MODEL, contents=contents)
+        )
+    except Exception as e:
+        code = getattr(e, 'code', None)
+        if isinstance(code, int) and (code == 429 or code >= 500):
+            match = re.search(GEMINI_RETRY_PATTERN, str(e), re.IGNORECASE)
+            raise UpstreamError(
+                f"Gemini returned {code}",
+                status=code,
+                retry_after=float(match.group(1)) if match else None
+            ) from e
+        raise
+
+def ai_unavailable_message(error):
+    """User-facing message for a Gemini outage, instead of echoing the raw error"""
+    if isinstance(error, CircuitOpenError) and error.probing:
+        return f"⏳ AI is checking whether it has recovered from an outage. Try again in up to {error.retry_in:.0f}s."
+    if isinstance(error, CircuitOpenError):
+        return f"⏳ AI is cooling down after repeated errors. Try again in {error.retry_in:.0f}s."
+    return "❌ AI is unavailable right now (quota or server error). Try again later."
+
 
 # Create bot instance with command prefix
 intents = discord.Intents.default()
@@ -70,16 +135,29 @@ async def get_twitch_token():
     try:
         async with aiohttp.ClientSession() as session:
             async with session.post(url, params=params) as response:
+                raise_for_upstream(response, "Twitch")
                 if response.status == 200:
                     data = await response.json()
                     twitch_access_token = data['access_token']
                     return twitch_access_token
+    except UpstreamError:
+        raise
+    except NETWORK_ERRORS as e:
+        raise UpstreamError(f"Twitch: {e}") from e
     except Exception as e:
         print(f"Error getting Twitch token: {e}")
     return None
 
 async def check_ironmouse_live():
-    """Check if Ironmouse is currently live on Twitch"""
+    """Check if Ironmouse is currently live on Twitch
+
+    Raises UpstreamError if Twitch is failing or its circuit is open, so an outage
+    isn't mistaken for the stream being offline.
+    """
+    return await twitch_upstream.call(fetch_ironmouse_stream)
+
+async def fetch_ironmouse_stream():
+    """Single attempt at fetching Ironmouse's stream from the Twitch API"""
     global twitch_access_token
     
     if not twitch_access_token:
@@ -99,8 +177,9 @@ async def check_ironmouse_live():
             async with session.get(url, headers=headers) as response:
                 if response.status == 401:  # Token expired
                     twitch_access_token = await get_twitch_token()
-                    return await check_ironmouse_live()
+                    return await fetch_ironmouse_stream()
                 
+                raise_for_upstream(response, "Twitch")
                 if response.status == 200:
                     data = await response.json()
                     if data['data']:
@@ -112,6 +191,10 @@ async def check_ironmouse_live():
                             'viewers': stream_data['viewer_count'],
                             'thumbnail': stream_data['thumbnail_url'].replace('{width}', '1920').replace('{height}', '1080')
                         }
+    except UpstreamError:
+        raise
+    except NETWORK_ERRORS as e:
+        raise UpstreamError(f"Twitch: {e}") from e
     except Exception as e:
         print(f"Error checking Twitch stream: {e}")
     
@@ -122,30 +205,25 @@ async def monitor_ironmouse_stream():
     """Background task to monitor Ironmouse's stream"""
     global is_currently_live
     
-    stream_data = await check_ironmouse_live()
+    try:
+        stream_data = await check_ironmouse_live()
+    except UpstreamError as e:
+        # Keep the current live state; an outage is not the stream ending
+        print(f"[TWITCH] Skipping check: {e}")
+        return
     
     if stream_data and not is_currently_live:
         # Stream just went live!
         is_currently_live = True
         
+        # Build the notification once and reuse it for every guild
+        notification = render_twitch_live(stream_data, IRONMOUSE_CHANNEL, notification_overrides)
+        
         # Find the notification channel in all guilds
         for guild in bot.guilds:
             channel = discord.utils.get(guild.text_channels, name=NOTIFICATION_CHANNEL_NAME)
             if channel:
-                embed = discord.Embed(
-                    title="🔴 IRONMOUSE IS LIVE! 🎤",
-                    description=f"**{stream_data['title']}**",
-                    color=discord.Color.red(),
-                    url=f"https://www.twitch.tv/{IRONMOUSE_CHANNEL}",
-                    timestamp=datetime.now()
-                )
-                
-                embed.add_field(name="🎮 Playing", value=stream_data['game'], inline=True)
-                embed.add_field(name="👁️ Viewers", value=f"{stream_data['viewers']:,}", inline=True)
-                embed.set_thumbnail(url="https://static-cdn.jtvnw.net/jtv_user_pictures/0c3d1b0f-8bec-4fb8-9c56-3850817b8c81-profile_image-300x300.png")
-                embed.set_image(url=stream_data['thumbnail'])
-                
-                await channel.send("WAH WAH WAAAAH!! *screams excitedly* I'M LIVE ON TWITCH RIGHT NOW >:3 come hang out with me uwu!! *bounces* ≽^•⩊•^≼", embed=embed)
+                await notification.send(channel)
                 print(f"[TWITCH] Ironmouse went live! Notified #{channel.name}")
     
     elif not stream_data and is_currently_live:
@@ -158,7 +236,53 @@ async def before_monitor():
     await bot.wait_until_ready()
 
 async def get_latest_youtube_video():
-    """Get Ironmouse's latest YouTube upload"""
+    """Get Ironmouse's latest YouTube upload
+
+    Raises UpstreamError if YouTube is failing, out of quota or its circuit is open.
+    """
+    if not YOUTUBE_API_KEY:
+        return None
+    return await youtube_upstream.call(fetch_latest_youtube_video)
+
+def seconds_until_youtube_quota_reset():
+    """Seconds until YouTube's daily quota resets (midnight Pacific)
+
+    Uses UTC-8 all year, so during daylight saving time we wait an extra hour
+    rather than probing before the reset.
+    """
+    now = datetime.utcnow() - timedelta(hours=8)
+    next_midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return (next_midnight - now).total_seconds()
+
+async def check_youtube_response(response):
+    """Raise UpstreamError for throttling, server errors, exhausted quota and other 403s"""
+    raise_for_upstream(response, "YouTube")
+    if response.status == 403:
+        try:
+            data = await response.json(content_type=None)
+        except (aiohttp.ClientError, ValueError):
+            data = None
+        error = data.get('error') if isinstance(data, dict) else None
+        errors = error.get('errors') if isinstance(error, dict) else None
+        if not isinstance(errors, list):
+            # Can't tell why we were refused, and a retry would cost another search
+            raise UpstreamError("YouTube returned HTTP 403", status=403, retryable=False)
+        
+        reasons = [err.get('reason') for err in errors if isinstance(err, dict)]
+        if 'quotaExceeded' in reasons or 'dailyLimitExceeded' in reasons:
+            # Quota resets daily, so keep the circuit open until then instead of probing
+            raise UpstreamError(
+                "YouTube quota exceeded",
+                status=403,
+                retry_after=seconds_until_youtube_quota_reset(),
+                retryable=False
+            )
+        if 'rateLimitExceeded' in reasons:
+            raise UpstreamError("YouTube rate limit exceeded", status=403)
+        raise UpstreamError(f"YouTube returned HTTP 403 ({', '.join(map(str, reasons))})", status=403, retryable=False)
+
+async def fetch_latest_youtube_video():
+    """Single attempt at fetching Ironmouse's latest upload from the YouTube API"""
     if not YOUTUBE_API_KEY:
         return None
     
@@ -175,6 +299,7 @@ async def get_latest_youtube_video():
     try:
         async with aiohttp.ClientSession() as session:
             async with session.get(url, params=params) as response:
+                await check_youtube_response(response)
                 if response.status == 200:
                     data = await response.json()
                     if data.get('items'):
@@ -190,6 +315,7 @@ async def get_latest_youtube_video():
                         }
                         
                         async with session.get(details_url, params=details_params) as details_response:
+                            await check_youtube_response(details_response)
                             if details_response.status == 200:
                                 details_data = await details_response.json()
                                 if details_data.get('items'):
@@ -204,6 +330,10 @@ async def get_latest_youtube_video():
                                         'likes': video_details['statistics'].get('likeCount', '0'),
                                         'is_live': 'liveStreamingDetails' in video_details
                                     }
+    except UpstreamError:
+        raise
+    except NETWORK_ERRORS as e:
+        raise UpstreamError(f"YouTube: {e}") from e
     except Exception as e:
         print(f"Error checking YouTube: {e}")
     
@@ -215,7 +345,11 @@ async def monitor_ironmouse_youtube():
     global last_video_id
     
     print(f"[YOUTUBE] Checking for new videos...")
-    video_data = await get_latest_youtube_video()
+    try:
+        video_data = await get_latest_youtube_video()
+    except UpstreamError as e:
+        print(f"[YOUTUBE] Skipping check: {e}")
+        return
     
     if video_data:
         print(f"[YOUTUBE] Found video: {video_data['title'][:50]}... (ID: {video_data['video_id']})")
@@ -223,50 +357,12 @@ async def monitor_ironmouse_youtube():
         
         # If this is a new video (and not our first run)
         if last_video_id and video_id != last_video_id:
-            # New video detected!
+            # New video detected! Build the notification once and reuse it for every guild
+            notification = render_youtube_video(video_data, notification_overrides)
             for guild in bot.guilds:
                 channel = discord.utils.get(guild.text_channels, name=NOTIFICATION_CHANNEL_NAME)
                 if channel:
-                    video_url = f"https://www.youtube.com/watch?v={video_id}"
-                    published_at = datetime.strptime(video_data['published_at'], "%Y-%m-%dT%H:%M:%SZ")
-                    
-                    # Different embed based on if it's live or uploaded
-                    if video_data['is_live']:
-                        embed = discord.Embed(
-                            title="🔴 IRONMOUSE IS LIVE ON YOUTUBE! 🎤",
-                            description=f"**{video_data['title']}**",
-                            color=discord.Color.red(),
-                            url=video_url,
-                            timestamp=published_at
-                        )
-                        message_text = "WAH WAH YOUTUBE STREAM TIME!! *jingles bells excitedly* >:3 let's gooo~ uwu ≽^•⩊•^≼ *giggles*"
-                    else:
-                        embed = discord.Embed(
-                            title="📺 NEW IRONMOUSE VIDEO! 💜",
-                            description=f"**{video_data['title']}**",
-                            color=discord.Color.purple(),
-                            url=video_url,
-                            timestamp=published_at
-                        )
-                        message_text = "omg omg NEW VIDEO JUST DROPPED!! *screams in gremlin* >:3 go watch it RIGHT NOW uwu *twirls* (ᐢ ᵕ ᐢ)"
-                    
-                    # Add description if available
-                    if video_data['description']:
-                        desc_preview = video_data['description'][:200]
-                        if len(video_data['description']) > 200:
-                            desc_preview += "..."
-                        embed.add_field(name="📝 Description", value=desc_preview, inline=False)
-                    
-                    # Add stats
-                    stats_text = f"👁️ {int(video_data['views']):,} views"
-                    if video_data['likes'] != '0':
-                        stats_text += f" | 👍 {int(video_data['likes']):,} likes"
-                    embed.add_field(name="📊 Stats", value=stats_text, inline=False)
-                    
-                    embed.set_thumbnail(url="https://yt3.googleusercontent.com/ytc/AIdro_kz-qVHQZQXchXAHFQCezPFuNXRdB7QpKUZFUJB=s160-c-k-c0x00ffffff-no-rj")
-                    embed.set_image(url=video_data['thumbnail'])
-                    
-                    await channel.send(message_text, embed=embed)
+                    await notification.send(channel)
                     print(f"[YOUTUBE] New {'livestream' if video_data['is_live'] else 'video'} from Ironmouse! Notified #{channel.name}")
         
         # Update last seen video ID
@@ -317,36 +413,83 @@ async def on_message(message):
         videos_channel = discord.utils.get(message.guild.channels, name='videos')
         
         if videos_channel:
-            # First message: embed with user info
-            embed = discord.Embed(
-                color=discord.Color.blue(),
-                timestamp=message.created_at
-            )
-            embed.set_author(
-                name=message.author.display_name,
-                icon_url=message.author.display_avatar.url
-            )
-            embed.add_field(
-                name="Original Channel",
-                value=message.channel.mention,
-                inline=False
-            )
-            await videos_channel.send(embed=embed)
+            guild_id = message.guild.id
             
-            # Second message: converted link(s) with 'kk' prefix
+            # Reserve new links before any await, so a burst of identical posts
+            # handled concurrently only forwards the link once
+            new_links = []
+            reposts = {}  # link_key -> (link, earlier message ID)
             for link in video_links:
-                converted_link = convert_link(link)
-                await videos_channel.send(converted_link)
+                if forwarded_links.reserve(guild_id, link):
+                    new_links.append(link)
+                else:
+                    earlier_id = forwarded_links.get(guild_id, link)
+                    if earlier_id:
+                        reposts.setdefault(link_key(link), (link, earlier_id))
+                    # Otherwise another handler (or this message) is still forwarding it
             
-            # Delete the original message
-            try:
-                await message.delete()
+            # Repeats: react to the earlier post instead of reposting
+            reacted = 0
+            failed_reactions = 0
+            for link, earlier_id in reposts.values():
+                try:
+                    await videos_channel.get_partial_message(earlier_id).add_reaction(REPOST_REACTION)
+                    reacted += 1
+                except discord.NotFound:
+                    # The earlier post was deleted, so forward this one as new
+                    forwarded_links.discard(guild_id, link)
+                    if forwarded_links.reserve(guild_id, link):
+                        new_links.append(link)
+                except discord.HTTPException as e:
+                    print(f"[VIDEOS] Could not react to earlier post {earlier_id}: {e}")
+                    failed_reactions += 1
+            
+            unsent_links = list(new_links)
+            if new_links:
+                try:
+                    # First message: embed with user info
+                    embed = discord.Embed(
+                        color=discord.Color.blue(),
+                        timestamp=message.created_at
+                    )
+                    embed.set_author(
+                        name=message.author.display_name,
+                        icon_url=message.author.display_avatar.url
+                    )
+                    embed.add_field(
+                        name="Original Channel",
+                        value=message.channel.mention,
+                        inline=False
+                    )
+                    await videos_channel.send(embed=embed)
+                    
+                    # Second message: converted link(s) with 'kk' prefix
+                    for link in new_links:
+                        converted_link = convert_link(link)
+                        forwarded = await videos_channel.send(converted_link)
+                        forwarded_links.add(guild_id, link, forwarded.id)
+                        unsent_links.remove(link)
+                except discord.HTTPException as e:
+                    print(f"[VIDEOS] Error forwarding links: {e}")
+                finally:
+                    # Release reservations for anything that didn't make it to #videos
+                    for link in unsent_links:
+                        forwarded_links.discard(guild_id, link)
+            
+            # Delete the original only once every link was reposted or reacted to. When the
+            # only action was a reaction, keep it so there's a record of who reposted what where.
+            if new_links and not unsent_links and not failed_reactions:
+                try:
+                    await message.delete()
+                    message_handled = True
+                    print(f"[VIDEOS] Forwarded {len(new_links)} link(s) and collapsed {reacted} repeat(s) from {message.author.display_name} to #videos and deleted original")
+                except discord.Forbidden:
+                    print(f"[VIDEOS] Warning: Bot doesn't have permission to delete messages in #{message.channel.name}")
+                except discord.HTTPException as e:
+                    print(f"[VIDEOS] Error deleting message: {e}")
+            elif reacted:
                 message_handled = True
-                print(f"[VIDEOS] Forwarded {len(video_links)} link(s) from {message.author.display_name} to #videos and deleted original")
-            except discord.Forbidden:
-                print(f"[VIDEOS] Warning: Bot doesn't have permission to delete messages in #{message.channel.name}")
-            except discord.HTTPException as e:
-                print(f"[VIDEOS] Error deleting message: {e}")
+                print(f"[VIDEOS] Collapsed {reacted} repeated link(s) from {message.author.display_name} into reactions on earlier #videos posts")
         else:
             print(f"[VIDEOS] Warning: 'videos' channel not found in {message.guild.name}")
     
@@ -355,7 +498,7 @@ async def on_message(message):
     
     # 0.5% chance to randomly respond with AI (skip if message was already handled by video forwarding)
     # Very low to avoid hitting Gemini API quota (20 requests/day free tier)
-    if genai_client and random.random() < 0.005 and not message_handled:
+    if genai_client and random.random() < 0.005 and not message_handled and not gemini_upstream.is_open():
         print(f"[RANDOM] Roll succeeded for message in #{message.channel.name}")
         
         # Check rate limit: no more than 10 messages per hour
@@ -421,10 +564,7 @@ Now react!"""
                 
                 # Generate AI response
                 async with message.channel.typing():
-                    response = genai_client.models.generate_content(
-                        model="gemini-2.5-flash-lite-preview-09-2025",
-                        contents=prompt,
-                    )
+                    response = await generate_ai_content(prompt)
                     
                     if response.text:
                         await message.channel.send(response.text)
@@ -455,10 +595,7 @@ async def ai_chat(ctx, *, message: str):
     async with ctx.typing():
         try:
             # Generate response using Gemini
-            response = genai_client.models.generate_content(
-                model="gemini-2.5-flash-lite-preview-09-2025",
-                contents=message,
-            )
+            response = await generate_ai_content(message)
             
             # Send the response back to Discord
             if response.text:
@@ -475,6 +612,9 @@ async def ai_chat(ctx, *, message: str):
             else:
                 await ctx.send("⚠️ No response generated from AI.")
                 
+        except UpstreamError as e:
+            await ctx.send(ai_unavailable_message(e))
+            print(f"AI Error: {e}")
         except Exception as e:
             await ctx.send(f"❌ Error generating AI response: {str(e)}")
             print(f"AI Error: {e}")
@@ -495,26 +635,18 @@ async def test_twitch(ctx):
         return
     
     async with ctx.typing():
-        stream_data = await check_ironmouse_live()
+        try:
+            stream_data = await check_ironmouse_live()
+        except UpstreamError as e:
+            await ctx.send(f"❌ Twitch API is unavailable right now: {e}")
+            return
         
         if stream_data:
             # Stream is live
-            embed = discord.Embed(
-                title="🔴 IRONMOUSE IS LIVE! 🎤",
-                description=f"**{stream_data['title']}**",
-                color=discord.Color.red(),
-                url=f"https://www.twitch.tv/{IRONMOUSE_CHANNEL}",
-                timestamp=datetime.now()
-            )
-            
-            embed.add_field(name="🎮 Playing", value=stream_data['game'], inline=True)
-            embed.add_field(name="👁️ Viewers", value=f"{stream_data['viewers']:,}", inline=True)
-            embed.set_thumbnail(url="https://static-cdn.jtvnw.net/jtv_user_pictures/0c3d1b0f-8bec-4fb8-9c56-3850817b8c81-profile_image-300x300.png")
-            embed.set_image(url=stream_data['thumbnail'])
-            embed.set_footer(text="✅ Twitch API working!")
+            notification = render_twitch_live(stream_data, IRONMOUSE_CHANNEL, notification_overrides, footer="✅ Twitch API working!")
             
             await ctx.send(f"✅ **Twitch API is working!** Sending test to {target_channel.mention}")
-            await target_channel.send("WAH WAH WAAAAH!! *screams excitedly* I'M LIVE ON TWITCH RIGHT NOW >:3 come hang out with me uwu!! *bounces* ≽^•⩊•^≼", embed=embed)
+            await notification.send(target_channel)
         else:
             await ctx.send(f"✅ **Twitch API is working!** Ironmouse is currently offline. (Would post to {target_channel.mention} when live)")
 
@@ -534,51 +666,51 @@ async def test_youtube(ctx):
         return
     
     async with ctx.typing():
-        video_data = await get_latest_youtube_video()
+        try:
+            video_data = await get_latest_youtube_video()
+        except UpstreamError as e:
+            await ctx.send(f"❌ YouTube API is unavailable right now: {e}")
+            return
         
         if video_data:
-            video_url = f"https://www.youtube.com/watch?v={video_data['video_id']}"
-            published_at = datetime.strptime(video_data['published_at'], "%Y-%m-%dT%H:%M:%SZ")
-            
-            if video_data['is_live']:
-                embed = discord.Embed(
-                    title="🔴 IRONMOUSE IS LIVE ON YOUTUBE! 🎤",
-                    description=f"**{video_data['title']}**",
-                    color=discord.Color.red(),
-                    url=video_url,
-                    timestamp=published_at
-                )
-                message_text = "WAH WAH YOUTUBE STREAM TIME!! *jingles bells excitedly* >:3 let's gooo~ uwu ≽^•⩊•^≼ *giggles*"
-            else:
-                embed = discord.Embed(
-                    title="📺 LATEST IRONMOUSE VIDEO 💜",
-                    description=f"**{video_data['title']}**",
-                    color=discord.Color.purple(),
-                    url=video_url,
-                    timestamp=published_at
-                )
-                message_text = "omg omg NEW VIDEO JUST DROPPED!! *screams in gremlin* >:3 go watch it RIGHT NOW uwu *twirls* (ᐢ ᵕ ᐢ)"
-            
-            if video_data['description']:
-                desc_preview = video_data['description'][:200]
-                if len(video_data['description']) > 200:
-                    desc_preview += "..."
-                embed.add_field(name="📝 Description", value=desc_preview, inline=False)
-            
-            stats_text = f"👁️ {int(video_data['views']):,} views"
-            if video_data['likes'] != '0':
-                stats_text += f" | 👍 {int(video_data['likes']):,} likes"
-            embed.add_field(name="📊 Stats", value=stats_text, inline=False)
-            
-            embed.set_thumbnail(url="https://yt3.googleusercontent.com/ytc/AIdro_kz-qVHQZQXchXAHFQCezPFuNXRdB7QpKUZFUJB=s160-c-k-c0x00ffffff-no-rj")
-            embed.set_image(url=video_data['thumbnail'])
-            embed.set_footer(text="✅ YouTube API working!")
+            notification = render_youtube_video(
+                video_data,
+                notification_overrides,
+                video_title="📺 LATEST IRONMOUSE VIDEO 💜",
+                footer="✅ YouTube API working!"
+            )
             
             await ctx.send(f"✅ **YouTube API is working!** Sending test to {target_channel.mention}")
-            await target_channel.send(message_text, embed=embed)
+            await notification.send(target_channel)
         else:
             await ctx.send("❌ YouTube API error. Check your API key or quota limits.")
 
+@bot.command(name='status')
+async def upstream_status(ctx):
+    """Show circuit breaker state for Twitch, YouTube and Gemini"""
+    print(f"[!STATUS] Command used by {ctx.author.display_name} in #{ctx.channel.name}")
+    
+    state_icons = {'closed': '🟢', 'half-open': '🟡', 'open': '🔴'}
+    statuses = [upstream.status() for upstream in (twitch_upstream, youtube_upstream, gemini_upstream)]
+    any_open = any(status['state'] != 'closed' for status in statuses)
+    
+    embed = discord.Embed(
+        title="🩺 Upstream Status",
+        color=discord.Color.orange() if any_open else discord.Color.green(),
+        timestamp=datetime.now()
+    )
+    
+    for status in statuses:
+        value = f"{state_icons[status['state']]} **{status['state']}**"
+        if status['state'] == 'open':
+            value += f" (probe in {status['retry_in']:.0f}s)"
+        value += f"\nCalls: {status['total_calls']:,} | Failures: {status['total_failures']:,} | Rejected: {status['total_rejected']:,}"
+        if status['last_error']:
+            value += f"\nLast error: {status['last_error']}"
+        embed.add_field(name=status['name'], value=value[:1024], inline=False)
+    
+    await ctx.send(embed=embed)
+
 @bot.command(name='sendreply')
 async def send_reply(ctx, message_id: str, *, reply_text: str):
     """Send a reply to a specific message by ID. Usage: !sendreply <message_id> <your message>"""
@@ -647,10 +779,7 @@ User's request: {user_message}
 Give a SHORT response (1 paragraph max, 2-3 sentences). If fact-checking, state if it's true/false/misleading and why briefly. If commenting, give a quick insight. Be direct and concise."""
             
             # Generate AI response
-            response = genai_client.models.generate_content(
-                model="gemini-2.5-flash-lite-preview-09-2025",
-                contents=prompt,
-            )
+            response = await generate_ai_content(prompt)
             
             if response.text:
                 # Create an embed for the response
@@ -709,6 +838,9 @@ Give a SHORT response (1 paragraph max, 2-3 sentences). If fact-checking, state
                 
         except discord.NotFound:
             await ctx.send("❌ Could not find the replied message.")
+        except UpstreamError as e:
+            await ctx.send(ai_unavailable_message(e))
+            print(f"Grigger Error: {e}")
         except Exception as e:
             await ctx.send(f"❌ Error: {str(e)}")
             print(f"Grigger Error: {e}")
@@ -0,0 +1,108 @@
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+# Same optional 2-letter embed-fixer prefix (vx, dd, kk, ...) that convert_link replaces
+PREFIXED_HOST_PATTERN = r'(^|\.)[a-z]{2}(instagram|tiktok)\.'
+VIDEO_HOSTS = ('instagram.com', 'tiktok.com')
+# Share/tracking params Instagram and TikTok add; anything else (e.g. img_index) is kept
+TRACKING_PARAMS = {'igsh', 'igshid', 'is_from_webapp', 'sender_device', 'sender_web_id', '_r', '_t', 'si', 'fbclid', 'share_app_id', 'share_item_id', 'share_link_id'}
+
+
+def is_tracking_param(name):
+    """True for query params that only identify the share, not the video"""
+    return name.lower().startswith('utm_') or name.lower() in TRACKING_PARAMS
+
+
+def canonicalize_link(link):
+    """Normalize a link so reposts of the same Instagram/TikTok video compare equal
+
+    Lowercases the host, drops www./m. and any vx/dd/kk-style prefix, and drops the
+    fragment. On Instagram/TikTok hosts, tracking params (utm_*, igsh, is_from_webapp,
+    ...) are removed and the rest are sorted; other hosts keep their query as-is.
+    """
+    parts = urlsplit(link.strip())
+    host = (parts.hostname or '').lower()
+    for subdomain in ('www.', 'm.'):
+        if host.startswith(subdomain):
+            host = host[len(subdomain):]
+    host = re.sub(PREFIXED_HOST_PATTERN, r'\1\2.', host)
+    path = parts.path.rstrip('/') or '/'
+
+    query = parts.query
+    if any(host == video_host or host.endswith('.' + video_host) for video_host in VIDEO_HOSTS):
+        params = [(name, value) for name, value in parse_qsl(query, keep_blank_values=True) if not is_tracking_param(name)]
+        query = urlencode(sorted(params))
+    return f"{host}{path}?{query}" if query else f"{host}{path}"
+
+
+def link_key(link):
+    """64-bit hash of the canonical link, so the index doesn't hold full URL strings"""
+    digest = hashlib.blake2b(canonicalize_link(link).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
+
+
+class ForwardedLinkIndex:
+    """Bounded, time-windowed index of links recently forwarded to #videos, per guild
+
+    Entries are kept in forwarding order, so expired and overflow entries are always
+    at the front and can be dropped in O(1) each.
+    """
+
+    def __init__(self, window=1800, max_entries=500):
+        self.window = window
+        self.max_entries = max_entries
+        self.guilds = {}  # guild_id -> OrderedDict(link_key -> (forwarded_at, message_id or None while pending))
+
+    def get(self, guild_id, link):
+        """Return the message ID the link was forwarded as, or None if not seen recently
+
+        A link that is reserved but whose forward hasn't been sent yet also returns None.
+        """
+        entry = self._live_entry(guild_id, link_key(link))
+        return entry[1] if entry else None
+
+    def reserve(self, guild_id, link):
+        """Claim a link for forwarding before any await, so concurrent reposts see it
+
+        Returns False if the link is already forwarded or reserved. The reservation is
+        completed with add() once sent, or dropped with discard() if the send fails.
+        """
+        key = link_key(link)
+        if self._live_entry(guild_id, key):
+            return False
+        self._store(guild_id, key, None)
+        return True
+
+    def add(self, guild_id, link, message_id):
+        """Record that a link was forwarded as message_id"""
+        self._store(guild_id, link_key(link), message_id)
+
+    def discard(self, guild_id, link):
+        """Forget a link, e.g. when its forwarded post was deleted or never sent"""
+        entries = self.guilds.get(guild_id)
+        if entries:
+            entries.pop(link_key(link), None)
+
+    def _live_entry(self, guild_id, key):
+        entries = self.guilds.get(guild_id)
+        if not entries:
+            return None
+        entry = entries.get(key)
+        if entry is None or time.monotonic() - entry[0] >= self.window:
+            return None
+        return entry
+
+    def _store(self, guild_id, key, message_id):
+        now = time.monotonic()
+        entries = self.guilds.setdefault(guild_id, OrderedDict())
+        entries[key] = (now, message_id)
+        entries.move_to_end(key)
+
+        # Drop expired entries, then the oldest ones if we're still over the cap
+        while entries and now - next(iter(entries.values()))[0] >= self.window:
+            entries.popitem(last=False)
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
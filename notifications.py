@@ -0,0 +1,153 @@
+import json
+import os
+from datetime import datetime
+
+import discord
+
+# Event types, also the keys used in the per-guild overrides file
+TWITCH_LIVE = "twitch_live"
+YOUTUBE_LIVE = "youtube_live"
+YOUTUBE_VIDEO = "youtube_video"
+
+DEFAULT_MESSAGES = {
+    TWITCH_LIVE: "WAH WAH WAAAAH!! *screams excitedly* I'M LIVE ON TWITCH RIGHT NOW >:3 come hang out with me uwu!! *bounces* ≽^•⩊•^≼",
+    YOUTUBE_LIVE: "WAH WAH YOUTUBE STREAM TIME!! *jingles bells excitedly* >:3 let's gooo~ uwu ≽^•⩊•^≼ *giggles*",
+    YOUTUBE_VIDEO: "omg omg NEW VIDEO JUST DROPPED!! *screams in gremlin* >:3 go watch it RIGHT NOW uwu *twirls* (ᐢ ᵕ ᐢ)",
+}
+
+TWITCH_AVATAR_URL = "https://static-cdn.jtvnw.net/jtv_user_pictures/0c3d1b0f-8bec-4fb8-9c56-3850817b8c81-profile_image-300x300.png"
+YOUTUBE_AVATAR_URL = "https://yt3.googleusercontent.com/ytc/AIdro_kz-qVHQZQXchXAHFQCezPFuNXRdB7QpKUZFUJB=s160-c-k-c0x00ffffff-no-rj"
+
+
+def load_template_overrides(path):
+    """Load per-guild message overrides: {"<guild_id>": {"twitch_live": "text {title} {url}", ...}}
+
+    Entries that aren't a guild ID mapping to a dict of str -> str are skipped.
+    """
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"[NOTIFY] Could not load template overrides from {path}: {e}")
+        return {}
+
+    if not isinstance(data, dict):
+        print(f"[NOTIFY] Ignoring template overrides in {path}: expected an object of guild IDs")
+        return {}
+
+    overrides = {}
+    for guild_id, templates in data.items():
+        try:
+            guild_id = int(guild_id)
+        except (TypeError, ValueError):
+            print(f"[NOTIFY] Skipping template overrides for invalid guild ID {guild_id!r}")
+            continue
+        if not isinstance(templates, dict):
+            print(f"[NOTIFY] Skipping template overrides for guild {guild_id}: expected an object")
+            continue
+        overrides[guild_id] = {
+            event: template for event, template in templates.items()
+            if isinstance(event, str) and isinstance(template, str)
+        }
+    return overrides
+
+
+class Notification:
+    """A go-live/upload event rendered once and reused for every destination guild"""
+
+    def __init__(self, event, embed, fields, overrides=None):
+        self.event = event
+        self.embed = embed
+        self.fields = fields  # Values available to override templates, e.g. {title}, {url}
+        self.overrides = overrides or {}
+        self.default_content = DEFAULT_MESSAGES[event]
+        self._rendered = {}  # template -> formatted message text
+
+    def content_for(self, guild_id):
+        """Message text for a guild, formatting each distinct override template only once"""
+        templates = self.overrides.get(guild_id)
+        template = templates.get(self.event) if isinstance(templates, dict) else None
+        if not isinstance(template, str) or not template:
+            return self.default_content
+        if template not in self._rendered:
+            try:
+                self._rendered[template] = template.format(**self.fields)
+            except Exception as e:
+                print(f"[NOTIFY] Bad {self.event} template for guild {guild_id}: {e}")
+                self._rendered[template] = self.default_content
+        return self._rendered[template]
+
+    async def send(self, channel):
+        """Send this notification to a channel"""
+        return await channel.send(self.content_for(channel.guild.id), embed=self.embed)
+
+
+def render_twitch_live(stream_data, channel_name, overrides=None, footer=None):
+    """Build the Twitch go-live notification"""
+    url = f"https://www.twitch.tv/{channel_name}"
+    embed = discord.Embed(
+        title="🔴 IRONMOUSE IS LIVE! 🎤",
+        description=f"**{stream_data['title']}**",
+        color=discord.Color.red(),
+        url=url,
+        timestamp=datetime.now()
+    )
+
+    embed.add_field(name="🎮 Playing", value=stream_data['game'], inline=True)
+    embed.add_field(name="👁️ Viewers", value=f"{stream_data['viewers']:,}", inline=True)
+    embed.set_thumbnail(url=TWITCH_AVATAR_URL)
+    embed.set_image(url=stream_data['thumbnail'])
+    if footer:
+        embed.set_footer(text=footer)
+
+    fields = {'title': stream_data['title'], 'game': stream_data['game'], 'viewers': stream_data['viewers'], 'url': url}
+    return Notification(TWITCH_LIVE, embed, fields, overrides)
+
+
+def render_youtube_video(video_data, overrides=None, video_title="📺 NEW IRONMOUSE VIDEO! 💜", footer=None):
+    """Build the YouTube upload or livestream notification"""
+    url = f"https://www.youtube.com/watch?v={video_data['video_id']}"
+    published_at = datetime.strptime(video_data['published_at'], "%Y-%m-%dT%H:%M:%SZ")
+
+    # Different embed based on if it's live or uploaded
+    if video_data['is_live']:
+        event = YOUTUBE_LIVE
+        embed = discord.Embed(
+            title="🔴 IRONMOUSE IS LIVE ON YOUTUBE! 🎤",
+            description=f"**{video_data['title']}**",
+            color=discord.Color.red(),
+            url=url,
+            timestamp=published_at
+        )
+    else:
+        event = YOUTUBE_VIDEO
+        embed = discord.Embed(
+            title=video_title,
+            description=f"**{video_data['title']}**",
+            color=discord.Color.purple(),
+            url=url,
+            timestamp=published_at
+        )
+
+    # Add description if available
+    if video_data['description']:
+        desc_preview = video_data['description'][:200]
+        if len(video_data['description']) > 200:
+            desc_preview += "..."
+        embed.add_field(name="📝 Description", value=desc_preview, inline=False)
+
+    # Add stats
+    stats_text = f"👁️ {int(video_data['views']):,} views"
+    if video_data['likes'] != '0':
+        stats_text += f" | 👍 {int(video_data['likes']):,} likes"
+    embed.add_field(name="📊 Stats", value=stats_text, inline=False)
+
+    embed.set_thumbnail(url=YOUTUBE_AVATAR_URL)
+    embed.set_image(url=video_data['thumbnail'])
+    if footer:
+        embed.set_footer(text=footer)
+
+    fields = {'title': video_data['title'], 'url': url, 'views': int(video_data['views']), 'likes': int(video_data['likes'])}
+    return Notification(event, embed, fields, overrides)
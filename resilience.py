@@ -0,0 +1,191 @@
+import asyncio
+import random
+import time
+
+# Circuit breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class UpstreamError(Exception):
+    """Raised when an upstream API call fails in a way the breaker should count"""
+
+    def __init__(self, message, status=None, retry_after=None, retryable=True):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+        self.retryable = retryable
+
+
+class CircuitOpenError(UpstreamError):
+    """Raised instead of calling an upstream whose circuit is open"""
+
+    def __init__(self, name, retry_in, probing=False):
+        if probing:
+            message = f"{name} is being re-checked after an outage (retry in up to {retry_in:.0f}s)"
+        else:
+            message = f"{name} circuit is open (retry in {retry_in:.0f}s)"
+        super().__init__(message, retryable=False)
+        self.retry_in = retry_in
+        self.probing = probing
+
+
+def parse_retry_after(value):
+    """Parse a Retry-After header value (seconds) into a float, or None"""
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        # HTTP-date form is not used by the APIs we talk to
+        return None
+
+
+class CircuitBreaker:
+    """Opens after repeated failures, fails fast while open, then lets one probe through"""
+
+    def __init__(self, name, failure_threshold=3, reset_timeout=60):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_until = 0.0
+        self.probe_in_flight = False
+        self.total_calls = 0
+        self.total_failures = 0
+        self.total_rejected = 0
+        self.last_error = None
+
+    def _set_state(self, state):
+        if state != self.state:
+            print(f"[BREAKER] {self.name}: {self.state} -> {state}")
+            self.state = state
+
+    def is_open(self):
+        """True while the circuit is open and not yet due for a probe"""
+        return self.state == OPEN and time.monotonic() < self.opened_until
+
+    def retry_in(self):
+        """Seconds until an open circuit will allow a probe"""
+        return max(0.0, self.opened_until - time.monotonic())
+
+    def before_call(self):
+        """Raise CircuitOpenError if the call should not reach the upstream"""
+        if self.state == OPEN:
+            if time.monotonic() < self.opened_until:
+                self.total_rejected += 1
+                raise CircuitOpenError(self.name, self.retry_in())
+            self._set_state(HALF_OPEN)
+
+        if self.state == HALF_OPEN:
+            # Only one probe at a time; everyone else keeps failing fast. If the probe
+            # fails the circuit reopens for reset_timeout, so that's the honest hint.
+            if self.probe_in_flight:
+                self.total_rejected += 1
+                raise CircuitOpenError(self.name, self.reset_timeout, probing=True)
+            self.probe_in_flight = True
+
+        self.total_calls += 1
+
+    def record_success(self):
+        self.failures = 0
+        self.probe_in_flight = False
+        self._set_state(CLOSED)
+
+    def record_failure(self, error=None, retry_after=None):
+        self.failures += 1
+        self.total_failures += 1
+        self.probe_in_flight = False
+        if error is not None:
+            self.last_error = str(error)[:200]
+
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.trip(retry_after)
+
+    def trip(self, retry_after=None):
+        """Open the circuit for reset_timeout, or longer if the upstream asked us to wait"""
+        wait = max(self.reset_timeout, retry_after or 0)
+        self.opened_until = time.monotonic() + wait
+        self._set_state(OPEN)
+
+    def release(self):
+        """Give up a half-open probe slot without recording a result"""
+        self.probe_in_flight = False
+
+    def status(self):
+        """Snapshot of the breaker for logging and the !status command"""
+        return {
+            'name': self.name,
+            'state': self.state,
+            'failures': self.failures,
+            'retry_in': self.retry_in() if self.state == OPEN else 0.0,
+            'total_calls': self.total_calls,
+            'total_failures': self.total_failures,
+            'total_rejected': self.total_rejected,
+            'last_error': self.last_error,
+        }
+
+
+class RetryPolicy:
+    """Capped exponential backoff with full jitter"""
+
+    def __init__(self, max_attempts=3, base_delay=1.0, max_delay=10.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt, retry_after=None):
+        """Delay before retry number `attempt` (0-based), honoring Retry-After"""
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+class Upstream:
+    """A named upstream API guarded by a circuit breaker and a retry policy"""
+
+    def __init__(self, name, breaker=None, policy=None):
+        self.name = name
+        self.breaker = breaker or CircuitBreaker(name)
+        self.policy = policy or RetryPolicy()
+
+    async def call(self, func, *args, **kwargs):
+        """Await func(*args, **kwargs), retrying and tripping the breaker on UpstreamError
+
+        A call counts as one breaker failure once its retries are used up, no matter
+        how many attempts it made. Any other exception is passed through untouched
+        and does not count against the upstream.
+        """
+        attempt = 0
+        while True:
+            self.breaker.before_call()
+            try:
+                result = await func(*args, **kwargs)
+            except UpstreamError as e:
+                attempt += 1
+                if e.retry_after is not None and e.retry_after > self.policy.max_delay:
+                    # Upstream wants us gone for longer than we're willing to wait
+                    self.breaker.record_failure(e)
+                    self.breaker.trip(e.retry_after)
+                    raise
+                if not e.retryable or attempt >= self.policy.max_attempts or self.breaker.state == HALF_OPEN:
+                    # Retries are used up: count one failure for the whole call
+                    self.breaker.record_failure(e, e.retry_after)
+                    raise
+                delay = self.policy.delay(attempt - 1, e.retry_after)
+                print(f"[RETRY] {self.name}: {e} - retrying in {delay:.1f}s (attempt {attempt + 1}/{self.policy.max_attempts})")
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                self.breaker.release()
+                raise
+            self.breaker.record_success()
+            return result
+
+    def is_open(self):
+        return self.breaker.is_open()
+
+    def status(self):
+        return self.breaker.status()